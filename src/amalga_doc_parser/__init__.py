@@ -5,12 +5,13 @@ Amalga Doc Parser - A tool for parsing and managing healthcare platform analysis
 __version__ = "0.1.0"
 
 # Import and expose public modules and functions
-from .parser import parse_document, DocumentParser, ParserError
+from .parser import parse_document, parse_document_from_bytes, DocumentParser, ParserError
 from .models import Document, Section, Table, Reference
 
 # Define what's available when using "from amalga_doc_parser import *"
 __all__ = [
     "parse_document",
+    "parse_document_from_bytes",
     "DocumentParser",
     "ParserError",
     "Document",
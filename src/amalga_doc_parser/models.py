@@ -5,13 +5,143 @@ This module defines the core data structures used to represent healthcare platfo
 analysis documents, including documents, sections, tables, and references.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field, InitVar
+from typing import List, Dict, Any, Optional, Iterator, Tuple, BinaryIO
 import json
+import os
+import sys
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
 
-@dataclass
+try:
+    import ijson
+except ImportError:  # optional speedup, see the "speedups" extra
+    ijson = None
+
+try:
+    import msgspec
+except ImportError:  # optional speedup, see the "speedups" extra
+    msgspec = None
+
+# Files at least this large are stream-parsed by Document.load_from_file when
+# ijson is installed; smaller files are cheaper to load in one go
+STREAMING_THRESHOLD = 1 << 20
+
+# Slotted dataclasses drop the per-instance __dict__; the option needs Python 3.10+
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# Value types orjson encodes byte-for-byte like the stdlib (dict keys must be
+# str, which orjson enforces without OPT_NON_STR_KEYS)
+_PLAIN_JSON_TYPES = frozenset((dict, list, tuple, str, int, bool, type(None)))
+
+
+def _is_plain_json(data: Any) -> bool:
+    """Return True if data holds nothing but the exact types in _PLAIN_JSON_TYPES."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type not in _PLAIN_JSON_TYPES:
+            return False
+        if value_type is dict:
+            stack.extend(value.values())
+        elif value_type is list or value_type is tuple:
+            stack.extend(value)
+    return True
+
+
+def _orjson_dumps(data: Any, indent: Optional[int]) -> Optional[bytes]:
+    """
+    Serialize data with orjson, or return None where the stdlib must do it.
+
+    orjson is used only for two-space indentation and plain JSON types. It
+    formats floats differently (1e16 rather than 1e+16) and encodes types the
+    stdlib rejects, such as datetime, UUID and dataclasses, so those go to the
+    stdlib, which also reports the unsupported ones with TypeError. The one
+    difference left is escaping: orjson writes non-ASCII characters and DEL
+    as UTF-8 where the stdlib writes \\uXXXX escapes; both decode the same.
+    """
+    if orjson is None or indent != 2 or not _is_plain_json(data):
+        return None
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    except orjson.JSONEncodeError:
+        return None  # e.g. integers wider than 64 bits or non-str keys; the stdlib handles these
+
+
+def _json_dumps(data: Any, indent: Optional[int] = 2) -> str:
+    """Serialize data to a JSON string, preferring orjson when installed."""
+    encoded = _orjson_dumps(data, indent)
+    if encoded is not None:
+        return encoded.decode("utf-8")
+    return json.dumps(data, indent=indent)
+
+
+def _json_dumps_bytes(data: Any, indent: Optional[int] = 2) -> bytes:
+    """Serialize data to UTF-8 encoded JSON, preferring orjson when installed."""
+    encoded = _orjson_dumps(data, indent)
+    if encoded is not None:
+        return encoded
+    return json.dumps(data, indent=indent).encode("utf-8")
+
+
+def _json_loads(data: Any) -> Any:
+    """Deserialize a JSON str or bytes document, preferring orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN and Infinity, which the stdlib accepts
+    return json.loads(data)
+
+
+def _build_json_value(events: Iterator[Tuple[str, str, Any]], event: str, value: Any) -> Any:
+    """Assemble one complete JSON value from an ijson event stream."""
+    if event not in ("start_map", "start_array"):
+        return value
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                break
+    return builder.value
+
+
+def _stream_json_array(events: Iterator[Tuple[str, str, Any]]) -> Iterator[Any]:
+    """Yield the items of a JSON array one at a time from an ijson event stream."""
+    for _, event, value in events:
+        if event == "end_array":
+            return
+        yield _build_json_value(events, event, value)
+
+
+def _stream_json_object(events: Iterator[Tuple[str, str, Any]]) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Yield (key, event, value) for each member of a JSON object.
+
+    The caller must consume each member's value from `events`, either with
+    _build_json_value or _stream_json_array, before advancing.
+    """
+    for _, event, value in events:
+        if event == "end_map":
+            return
+        key = value
+        _, event, value = next(events)
+        yield key, event, value
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Reference:
     """A reference or citation in the document."""
     id: str
@@ -27,13 +157,15 @@ class Reference:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Reference':
         """Create a Reference instance from a dictionary."""
+        ref_id = data["id"]
         return cls(
-            id=data["id"],
+            # Reference ids are short and highly repetitive across documents
+            id=sys.intern(ref_id) if isinstance(ref_id, str) else ref_id,
             text=data["text"]
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Table:
     """A table in the document."""
     id: str
@@ -61,7 +193,7 @@ class Table:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Section:
     """A section or subsection in the document."""
     name: str
@@ -72,26 +204,58 @@ class Section:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert the section to a dictionary for JSON serialization."""
-        return {
-            "name": self.name,
-            "raw_name": self.raw_name,
-            "content": self.content,
-            "level": self.level,
-            "subsections": [subsec.to_dict() for subsec in self.subsections]
-        }
+        # Walk the subsection tree with an explicit stack rather than recursion
+        result: Dict[str, Any] = {}
+        stack = [(self, result)]
+        while stack:
+            section, out = stack.pop()
+            subsections = [{} for _ in section.subsections]
+            out["name"] = section.name
+            out["raw_name"] = section.raw_name
+            out["content"] = section.content
+            out["level"] = section.level
+            out["subsections"] = subsections
+            stack.extend(zip(section.subsections, subsections))
+        return result
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Section':
         """Create a Section instance from a dictionary."""
-        section = cls(
+        root = cls(
             name=data["name"],
             raw_name=data.get("raw_name", ""),
             content=data["content"],
             level=data["level"]
         )
-        section.subsections = [
-            Section.from_dict(subsec) for subsec in data.get("subsections", [])
-        ]
+        # Build the subsection tree iteratively with the fast constructor
+        stack = [(data, root)]
+        while stack:
+            section_data, section = stack.pop()
+            for subsec_data in section_data.get("subsections", []):
+                subsec = Section._new(
+                    subsec_data["name"],
+                    subsec_data.get("raw_name", ""),
+                    subsec_data["content"],
+                    subsec_data["level"]
+                )
+                section.subsections.append(subsec)
+                stack.append((subsec_data, subsec))
+        return root
+
+    @classmethod
+    def _new(cls, name: str, raw_name: str, content: str, level: int) -> 'Section':
+        """
+        Create a Section without its subsections, bypassing the dataclass __init__.
+        
+        Only for internal use by the loaders, which attach the subsections.
+        Every dataclass field must be assigned here.
+        """
+        section = cls.__new__(cls)
+        section.name = name
+        section.raw_name = raw_name
+        section.content = content
+        section.level = level
+        section.subsections = []
         return section
 
     def add_subsection(self, subsection: 'Section') -> None:
@@ -99,7 +263,7 @@ class Section:
         self.subsections.append(subsection)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Document:
     """The top-level document representation."""
     title: str
@@ -107,10 +271,12 @@ class Document:
     tables: List[Table] = field(default_factory=list)
     references: List[Reference] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Loaders pass False so deserialized documents keep exactly the stored metadata
+    stamp_created_at: InitVar[bool] = True
     
-    def __post_init__(self):
+    def __post_init__(self, stamp_created_at: bool):
         """Initialize metadata with creation timestamp if not present."""
-        if "created_at" not in self.metadata:
+        if stamp_created_at and "created_at" not in self.metadata:
             self.metadata["created_at"] = datetime.now().isoformat()
 
     def to_dict(self) -> Dict[str, Any]:
@@ -127,7 +293,7 @@ class Document:
 
     def to_json(self, indent: int = 2) -> str:
         """Serialize the document to a JSON string."""
-        return json.dumps(self.to_dict(), indent=indent)
+        return _json_dumps(self.to_dict(), indent)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Document':
@@ -140,7 +306,8 @@ class Document:
         document = cls(
             title=data["title"],
             sections=[Section.from_dict(section) for section in data.get("sections", [])],
-            metadata=metadata if isinstance(metadata, dict) else {}
+            metadata=metadata if isinstance(metadata, dict) else {},
+            stamp_created_at=False
         )
         
         # Add tables and references
@@ -152,18 +319,124 @@ class Document:
     @classmethod
     def from_json(cls, json_str: str) -> 'Document':
         """Create a Document instance from a JSON string."""
-        data = json.loads(json_str)
+        if msgspec is not None:
+            try:
+                wire = _DOCUMENT_DECODER.decode(json_str)
+            except msgspec.DecodeError:
+                pass  # let the generic path below report or tolerate it
+            else:
+                return cls._from_wire(wire)
+        data = _json_loads(json_str)
         return cls.from_dict(data)
 
+    @classmethod
+    def _from_wire(cls, wire: '_DocumentWire') -> 'Document':
+        """Create a Document from msgspec-decoded JSON."""
+        metadata = wire.metadata
+        tables_data = metadata.pop("tables", [])
+        refs_data = metadata.pop("references", [])
+        
+        document = cls(
+            title=wire.title,
+            sections=_sections_from_wire(wire.sections),
+            metadata=metadata,
+            stamp_created_at=False
+        )
+        document.tables = [Table.from_dict(table) for table in tables_data]
+        document.references = [Reference.from_dict(ref) for ref in refs_data]
+        
+        return document
+
+    @classmethod
+    def _from_json_stream(cls, f: BinaryIO) -> 'Document':
+        """
+        Create a Document from a binary JSON file without materializing it whole.
+
+        Sections, tables and references are decoded and converted one at a
+        time, so peak memory is bounded by the largest single item rather
+        than the whole document.
+
+        Only handles the layout to_dict produces. Anything else, such as a
+        non-array "sections" or a repeated key, raises ValueError so that
+        load_from_file can hand the file to from_json, which defines how
+        such input is loaded or rejected.
+        """
+        events = iter(ijson.parse(f, use_float=True))
+        title = None
+        has_title = False
+        sections: List[Section] = []
+        tables: List[Table] = []
+        references: List[Reference] = []
+        metadata: Dict[str, Any] = {}
+        seen = set()
+
+        def claim(name: str) -> None:
+            # from_dict keeps only the last of repeated keys; stream just one
+            if name in seen:
+                raise ValueError(f"Cannot stream a repeated {name!r}")
+            seen.add(name)
+
+        def expect_array(name: str, event: str) -> None:
+            claim(name)
+            if event != "start_array":
+                raise ValueError(f"Cannot stream a non-array {name!r}")
+
+        _, event, _ = next(events)
+        if event != "start_map":
+            raise ValueError("Document JSON must be an object")
+
+        for key, event, value in _stream_json_object(events):
+            if key == "sections":
+                expect_array("sections", event)
+                sections = [Section.from_dict(item) for item in _stream_json_array(events)]
+            elif key == "metadata":
+                claim("metadata")
+                if event != "start_map":
+                    # from_dict ignores a metadata value that is not an object
+                    _build_json_value(events, event, value)
+                    continue
+                for meta_key, event, value in _stream_json_object(events):
+                    if meta_key == "tables":
+                        expect_array("tables", event)
+                        tables = [Table.from_dict(item) for item in _stream_json_array(events)]
+                    elif meta_key == "references":
+                        expect_array("references", event)
+                        references = [Reference.from_dict(item) for item in _stream_json_array(events)]
+                    else:
+                        metadata[meta_key] = _build_json_value(events, event, value)
+            else:
+                value = _build_json_value(events, event, value)
+                if key == "title":
+                    title = value
+                    has_title = True
+
+        if not has_title:
+            raise KeyError("title")
+
+        document = cls(title=title, sections=sections, metadata=metadata, stamp_created_at=False)
+        document.tables = tables
+        document.references = references
+        return document
+
     def save_to_file(self, filepath: str) -> None:
         """Save the document to a JSON file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self.to_json())
+        # Write the encoded bytes directly to skip a decode/encode round trip
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps_bytes(self.to_dict()))
 
     @classmethod
     def load_from_file(cls, filepath: str) -> 'Document':
         """Load a document from a JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open(filepath, 'rb') as f:
+            if ijson is not None and os.fstat(f.fileno()).st_size >= STREAMING_THRESHOLD:
+                try:
+                    return cls._from_json_stream(f)
+                except Exception:
+                    # The stream loader takes only well-formed documents (ijson
+                    # even rejects the NaN and Infinity the stdlib writes); for
+                    # anything else, let the in-memory path load or report it
+                    # exactly as it does for smaller files
+                    f.seek(0)
             return cls.from_json(f.read())
 
     def add_section(self, section: Section) -> None:
@@ -178,3 +451,43 @@ class Document:
         """Add a reference to the document."""
         self.references.append(reference)
 
+    def references_by_id(self) -> Dict[str, Reference]:
+        """
+        Build a dict of the references keyed by id.
+        
+        A later reference wins over an earlier one with the same id. Each call
+        walks the whole `references` list, so build the dict once and reuse it
+        for repeated lookups.
+        """
+        return {ref.id: ref for ref in self.references}
+
+
+if msgspec is not None:
+    class _SectionWire(msgspec.Struct):
+        """Serialized Section layout, requiring the same keys as Section.from_dict."""
+        name: str
+        content: str
+        level: int
+        raw_name: str = ""
+        subsections: List['_SectionWire'] = []
+
+    class _DocumentWire(msgspec.Struct):
+        """Serialized Document layout; msgspec validates the whole section tree while decoding."""
+        title: str
+        sections: List[_SectionWire] = []
+        metadata: Dict[str, Any] = {}
+
+    def _sections_from_wire(wires: List[_SectionWire]) -> List[Section]:
+        """Convert decoded section trees to Sections via the fast constructor."""
+        sections: List[Section] = []
+        stack = [(wires, sections)]
+        while stack:
+            items, out = stack.pop()
+            for wire in items:
+                section = Section._new(wire.name, wire.raw_name, wire.content, wire.level)
+                out.append(section)
+                if wire.subsections:
+                    stack.append((wire.subsections, section.subsections))
+        return sections
+
+    _DOCUMENT_DECODER = msgspec.json.Decoder(_DocumentWire)
@@ -5,28 +5,102 @@ This module contains functionality to parse markdown documents and extract
 structured information like sections, subsections, tables, and references.
 """
 
+import io
 import re
 import logging
-from typing import List, Dict, Tuple, Optional, Iterator, Any
+import mmap
+from collections import deque
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, Iterator, Iterable, Callable, Any
 import os
+import stat
+import sys
 from pathlib import Path
 
 from .models import Document, Section, Table, Reference
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Logging is left for the application to configure
 logger = logging.getLogger(__name__)
 
-# Regular expressions for parsing
+# Regular expressions for parsing. TABLE_ROW_PATTERN and TABLE_SEPARATOR_PATTERN
+# are kept for callers; the parser recognizes table rows with _LINE_RE below.
 SECTION_HEADER_PATTERN = re.compile(r"^(#{1,6})\s*((?:\d+\.)*\d*\.?\s*)?(.+)$")
 TABLE_ROW_PATTERN = re.compile(r"^\|(.+)\|$")
 TABLE_SEPARATOR_PATTERN = re.compile(r"^\|(\s*[-:]+[-:]\s*\|)+$")
 TABLE_CAPTION_PATTERN = re.compile(r"^(?:Table|TABLE)\s+[\d\.]+:?\s+(.+)$")
 REFERENCE_PATTERN = re.compile(r"^\[(\d+)\]\s+(.+)$")
 
+# The parser matches lines as raw UTF-8 bytes so that only the parts actually
+# kept in the document get decoded; these are bytes copies of the patterns
+# above. All of them match in time linear in the line length, even on
+# malformed input, so the stdlib backtracking engine is safe to use here.
+_SECTION_HEADER_RE = re.compile(SECTION_HEADER_PATTERN.pattern.encode("ascii"))
+_TABLE_CAPTION_RE = re.compile(TABLE_CAPTION_PATTERN.pattern.encode("ascii"))
+_REFERENCE_RE = re.compile(REFERENCE_PATTERN.pattern.encode("ascii"))
+
+# Single-pass line classifier: one regex entry per line, dispatched on lastgroup.
+# Separator rows (|---|---|) are a subset of the table-row branch.
+_LINE_RE = re.compile(
+    rb"^(?P<header>#{1,6}\s*(?:(?:\d+\.)*\d*\.?\s*)?.+)$"
+    rb"|^(?P<table>\|.+\|)$"
+    rb"|^(?P<reference>\[\d+\]\s+.+)$"
+)
+# Leading bytes that can start a structural line; anything else is prose
+STRUCTURAL_CHARS = frozenset((b"#", b"|", b"["))
+# Trailing whitespace as str.rstrip sees it: the ASCII characters, including
+# the separators \x1c-\x1f that bytes.rstrip leaves alone, and the UTF-8
+# encodings of the non-ASCII spaces (U+0085, NBSP, U+1680, U+2000-U+200A,
+# U+2028, U+2029, U+202F, U+205F, U+3000)
+_ASCII_SPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+_NON_ASCII_SPACE_ENDINGS = (
+    b"\xc2\x85", b"\xc2\xa0", b"\xe1\x9a\x80",
+    *(b"\xe2\x80" + bytes((i,)) for i in range(0x80, 0x8b)),
+    b"\xe2\x80\xa8", b"\xe2\x80\xa9", b"\xe2\x80\xaf", b"\xe2\x81\x9f", b"\xe3\x80\x80",
+)
+# Their last two bytes; a line ending in one of these is re-stripped as text,
+# which also copes with the rare other character sharing the same tail
+_NON_ASCII_SPACE_TAILS = frozenset(ending[-2:] for ending in _NON_ASCII_SPACE_ENDINGS)
+# Leading section numbers such as "1." or "2.1."
+_CLEAN_RE = re.compile(r"^\d+\.(?:\d+\.)*\s*")
+# Cell delimiter together with its surrounding whitespace
+_CELL_SPLIT = re.compile(r"\s*\|\s*")
+
+# Input is consumed in chunks of this many bytes and split into lines in bulk
+READ_CHUNK_SIZE = 1 << 20
+
+
+def _iter_lines(read: Callable[[int], bytes], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield the lines of a binary stream, reading it in large chunks.
+    
+    Lines keep their line endings. Like text-mode universal newlines, "\n",
+    "\r\n" and a lone "\r" all end a line.
+    """
+    # Pieces of a line not yet ended, joined only once its end arrives so a
+    # line spanning many chunks is copied once rather than once per chunk
+    pending: List[bytes] = []
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        # A pending line ending in "\r" is complete unless "\n" follows, so
+        # the chunk must still be split against it
+        if b"\n" not in chunk and b"\r" not in chunk and not (pending and pending[-1].endswith(b"\r")):
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(chunk)
+            chunk = b"".join(pending)
+            pending = []
+        lines = chunk.splitlines(keepends=True)
+        # A line without "\n" may continue in the next chunk (including the
+        # "\n" of a "\r\n" split across the boundary)
+        if not lines[-1].endswith(b"\n"):
+            pending.append(lines.pop())
+        yield from lines
+    if pending:
+        yield b"".join(pending)
+
 
 class ParserError(Exception):
     """Exception raised for errors during document parsing."""
@@ -41,23 +115,33 @@ class DocumentParser:
         # Initialize parser state
         self.document = None
         self.current_section = None
-        self.section_stack = []
+        # Most recent open section per header level (index 1-6), for O(1) parent lookup
+        self._sections_by_level: List[Optional[Section]] = [None] * 7
         self.table_buffer = []
+        # Last few content lines of the current section, for table caption lookup
+        self._recent_lines = deque(maxlen=5)
+        # Encoded content chunks per section, decoded once in _finalize_parsing
+        self._section_chunks: List[Tuple[Section, List[bytes]]] = []
+        self._current_chunks: List[bytes] = []
         self.is_in_table = False
         self.table_count = 0
         self.seen_document_title = False
         
         # List of expected sections for validation
         self.expected_sections = [
-            "Executive Summary",
-            "Platform Overview",
-            "Core Capabilities",
-            "Data Management Architecture",
-            "User Experience and Interface Design",
-            "Technological Foundations",
-            "Competitive Differentiation",
-            "Lessons Learned"
+            sys.intern(name) for name in (
+                "Executive Summary",
+                "Platform Overview",
+                "Core Capabilities",
+                "Data Management Architecture",
+                "User Experience and Interface Design",
+                "Technological Foundations",
+                "Competitive Differentiation",
+                "Lessons Learned"
+            )
         ]
+        # Lowercased once for case-insensitive matching during validation
+        self._expected_sections_lower = [name.lower() for name in self.expected_sections]
 
     def parse_file(self, filepath: str, title: Optional[str] = None) -> Document:
         """Parse a markdown file into a Document."""
@@ -68,57 +152,18 @@ class DocumentParser:
         self.document = Document(title=title if title else Path(filepath).stem.replace("_", " ").title())
         
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                current_content = []
-                
-                for line in f:
-                    line = line.rstrip()
-                    
-                    # Check for section header
-                    header_match = SECTION_HEADER_PATTERN.match(line)
-                    if header_match:
-                        # Process any buffered content
-                        if current_content and self.current_section:
-                            self.current_section.content += "\n".join(current_content) + "\n"
-                        current_content = []
-                        
-                        # Process the header
-                        hashes, number_part, title_part = header_match.groups()
-                        self._process_section_header(title_part, len(hashes), number_part)
-                        continue
-                    
-                    # Check for table
-                    if TABLE_ROW_PATTERN.match(line) or TABLE_SEPARATOR_PATTERN.match(line):
-                        if current_content and not self.is_in_table:
-                            if self.current_section:
-                                self.current_section.content += "\n".join(current_content) + "\n"
-                            current_content = []
-                        self.table_buffer.append(line)
-                        self.is_in_table = True
-                    elif self.is_in_table and not line.strip():
-                        self._process_table_buffer()
-                    else:
-                        # Check for reference
-                        ref_match = REFERENCE_PATTERN.match(line)
-                        if ref_match:
-                            ref_id, ref_text = ref_match.groups()
-                            self.document.add_reference(Reference(id=ref_id, text=ref_text))
-                        
-                        # Add to current content
-                        if self.current_section:
-                            current_content.append(line)
-                
-                # Process any remaining content
-                if current_content and self.current_section:
-                    self.current_section.content += "\n".join(current_content) + "\n"
-                
-                self._finalize_parsing()
+            with open(filepath, "rb") as f:
+                # Only map regular files with content: mmap cannot map an empty
+                # file, and pipes, devices and procfs files report a size of 0
+                # however much they hold, so those are read as a stream
+                st = os.fstat(f.fileno())
+                if stat.S_ISREG(st.st_mode) and st.st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self._parse_lines(_iter_lines(mm.read))
+                else:
+                    self._parse_lines(_iter_lines(f.read))
                 
-            logger.info(f"Successfully parsed document: {self.document.title}")
-            logger.info(f"Found {len(self.document.sections)} top-level sections, "
-                       f"{len(self.document.tables)} tables, and "
-                       f"{len(self.document.references)} references")
-            
+            self._log_summary()
             return self.document
             
         except Exception as e:
@@ -126,11 +171,127 @@ class DocumentParser:
             logger.error(error_msg)
             raise ParserError(error_msg) from e
             
-    def _clean_section_name(self, section_name: str) -> str:
+    def parse_bytes(self, data: bytes, source_name: str, title: Optional[str] = None) -> Document:
+        """
+        Parse UTF-8 encoded markdown already held in memory into a Document.
+        
+        source_name stands in for the file path: it supplies the default
+        title and names the source in log and error messages.
+        """
+        self.document = Document(title=title if title else Path(source_name).stem.replace("_", " ").title())
+        
+        try:
+            self._parse_lines(_iter_lines(io.BytesIO(data).read))
+            self._log_summary()
+            return self.document
+            
+        except Exception as e:
+            error_msg = f"Error parsing {source_name}: {str(e)}"
+            logger.error(error_msg)
+            raise ParserError(error_msg) from e
+            
+    def _log_summary(self) -> None:
+        """Log what was extracted from the document just parsed."""
+        logger.info("Successfully parsed document: %s", self.document.title)
+        logger.info("Found %d top-level sections, %d tables, and %d references",
+                    len(self.document.sections),
+                    len(self.document.tables),
+                    len(self.document.references))
+            
+    def _parse_lines(self, lines: Iterable[bytes]) -> None:
+        """
+        Parse raw UTF-8 encoded lines into the current document.
+        
+        Lines stay as bytes throughout; header, reference and table text is
+        decoded when extracted, and section content once per section in
+        _finalize_parsing.
+        """
+        current_content = []
+        
+        # Bind per-line lookups to locals once instead of resolving module
+        # globals and bound methods on every iteration
+        match_line = _LINE_RE.match
+        structural_chars = STRUCTURAL_CHARS
+        ascii_space = _ASCII_SPACE
+        non_ascii_space_tails = _NON_ASCII_SPACE_TAILS
+        add_content_line = current_content.append
+        
+        for raw_line in lines:
+            line = raw_line.rstrip(ascii_space)
+            # Strip trailing Unicode whitespace the way decoded text would be
+            if line and line[-1] > 0x7f and line[-2:] in non_ascii_space_tails:
+                line = line.decode("utf-8").rstrip().encode("utf-8")
+            
+            # Only lines starting with a structural byte reach the regex
+            kind = None
+            if line[:1] in structural_chars:
+                line_match = match_line(line)
+                if line_match:
+                    kind = line_match.lastgroup
+            
+            # Fast path for prose and blank lines, the bulk of any document
+            if kind is None:
+                if self.is_in_table and not line:
+                    self._process_table_buffer()
+                elif self.current_section:
+                    add_content_line(line)
+                continue
+            
+            # Check for section header
+            if kind == "header":
+                # Process any buffered content
+                if current_content and self.current_section:
+                    self._append_content(current_content)
+                current_content.clear()
+                
+                # Process the header
+                hashes, number_part, title_part = _SECTION_HEADER_RE.match(line).groups()
+                self._process_section_header(
+                    title_part.decode("utf-8"),
+                    len(hashes),
+                    number_part.decode("utf-8") if number_part is not None else None
+                )
+                continue
+            
+            # Check for table
+            if kind == "table":
+                if current_content and not self.is_in_table:
+                    if self.current_section:
+                        self._append_content(current_content)
+                    current_content.clear()
+                self.table_buffer.append(line)
+                self.is_in_table = True
+            elif self.is_in_table and not line.strip():
+                self._process_table_buffer()
+            else:
+                # Check for reference
+                if kind == "reference":
+                    ref_id, ref_text = _REFERENCE_RE.match(line).groups()
+                    self.document.add_reference(
+                        Reference(id=ref_id.decode("utf-8"), text=ref_text.decode("utf-8"))
+                    )
+                
+                # Add to current content
+                if self.current_section:
+                    add_content_line(line)
+        
+        # Process any remaining content
+        if current_content and self.current_section:
+            self._append_content(current_content)
+        
+        self._finalize_parsing()
+            
+    def _append_content(self, lines: List[bytes]) -> None:
+        """Buffer a run of encoded content lines on the current section."""
+        self._current_chunks.append(b"\n".join(lines) + b"\n")
+        self._recent_lines.extend(lines)
+        
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _clean_section_name(section_name: str) -> str:
         """Remove numeric prefixes and extra whitespace from section names."""
         # Remove leading numbers (e.g., "1." or "2.1.") while preserving the rest
-        cleaned = re.sub(r"^\d+\.(?:\d+\.)*\s*", "", section_name)
-        return cleaned.strip()
+        return _CLEAN_RE.sub("", section_name).strip()
         
     def _process_section_header(self, title_part: str, level: int, number_part: Optional[str] = None) -> None:
         """Process a section header and update document structure."""
@@ -138,15 +299,15 @@ class DocumentParser:
         raw_name = f"{number_part} {title_part}" if number_part else title_part
         raw_name = raw_name.strip()
         
-        logger.info(f"Processing section: {raw_name} (level {level})")
+        logger.info("Processing section: %s (level %d)", raw_name, level)
         
         # Skip first level 1 header for document title
         if level == 1 and not self.seen_document_title:
             self.seen_document_title = True
             return
             
-        # Clean section name for matching
-        cleaned_name = self._clean_section_name(raw_name)
+        # Clean section name for matching; interned since titles recur across documents
+        cleaned_name = sys.intern(self._clean_section_name(raw_name))
         
         # Create section with both raw and cleaned names
         section = Section(
@@ -156,32 +317,34 @@ class DocumentParser:
         )
         
         # Handle section hierarchy
+        by_level = self._sections_by_level
         if level == 1:
             # Top-level section
-            logger.info(f"Adding top-level section: {raw_name}")
+            logger.info("Adding top-level section: %s", raw_name)
             self.document.add_section(section)
-            self.section_stack = [section]
         else:
-            # Find appropriate parent by looking for the closest section with a lower level
-            parent_found = False
-            for i in range(len(self.section_stack) - 1, -1, -1):
-                potential_parent = self.section_stack[i]
-                if potential_parent.level < level:
-                    # Found a valid parent
-                    logger.info(f"Adding subsection {raw_name} to parent {potential_parent.raw_name}")
-                    potential_parent.add_subsection(section)
-                    # Update stack by removing anything after the parent and adding this section
-                    self.section_stack = self.section_stack[:i+1] + [section]
-                    parent_found = True
+            # The parent is the closest open section with a lower level
+            parent = None
+            for potential_parent in reversed(by_level[1:level]):
+                if potential_parent is not None:
+                    parent = potential_parent
                     break
             
-            if not parent_found:
+            if parent is not None:
+                logger.info("Adding subsection %s to parent %s", raw_name, parent.raw_name)
+                parent.add_subsection(section)
+            else:
                 # No parent found, add to root
-                logger.warning(f"No parent found for {raw_name}, adding to root")
+                logger.warning("No parent found for %s, adding to root", raw_name)
                 self.document.add_section(section)
-                self.section_stack = [section]
+        
+        # This section closes any open sections at its own level or deeper
+        by_level[level:] = [section] + [None] * (len(by_level) - level - 1)
         
         self.current_section = section
+        self._current_chunks = []
+        self._section_chunks.append((section, self._current_chunks))
+        self._recent_lines.clear()
     
     def _process_table_buffer(self, caption: str = "") -> None:
         """Process the buffered table lines and add table to document."""
@@ -192,20 +355,21 @@ class DocumentParser:
         # Parse table structure
         headers = []
         rows = []
+        table_lines = [line.decode("utf-8") for line in self.table_buffer]
         
         # If there's at least 2 rows, first row is likely headers
-        if len(self.table_buffer) >= 2:
+        if len(table_lines) >= 2:
             # First row should be headers
-            header_line = self.table_buffer[0]
+            header_line = table_lines[0]
             if "|" in header_line:
-                headers = [cell.strip() for cell in header_line.strip("|").split("|")]
+                headers = _CELL_SPLIT.split(header_line.strip("|").strip())
             
             # Skip the separator line (|---|---|)
-            data_rows = self.table_buffer[2:] if len(self.table_buffer) > 2 else []
+            data_rows = table_lines[2:] if len(table_lines) > 2 else []
             
             for row_line in data_rows:
                 if row_line and "|" in row_line:
-                    row_data = [cell.strip() for cell in row_line.strip("|").split("|")]
+                    row_data = _CELL_SPLIT.split(row_line.strip("|").strip())
                     rows.append(row_data)
         
         # Create and add the table
@@ -218,11 +382,10 @@ class DocumentParser:
             
             # Try to find caption in the current section's content
             if self.current_section:
-                lines = self.current_section.content.splitlines()
-                for line in lines[-5:]:  # Look at the last few lines
-                    caption_match = TABLE_CAPTION_PATTERN.match(line)
+                for line in self._recent_lines:  # Look at the last few lines
+                    caption_match = _TABLE_CAPTION_RE.match(line)
                     if caption_match:
-                        caption = line.strip()
+                        caption = line.decode("utf-8").strip()
                         break
         
         table = Table(
@@ -233,7 +396,7 @@ class DocumentParser:
         )
         self.document.add_table(table)
         
-        logger.debug(f"Processed table: {table_id} - {caption}")
+        logger.debug("Processed table: %s - %s", table_id, caption)
         
         # Reset table state
         self.table_buffer = []
@@ -245,6 +408,13 @@ class DocumentParser:
         if self.is_in_table and self.table_buffer:
             self._process_table_buffer()
             
+        # Join and decode buffered content exactly once per section
+        for section, chunks in self._section_chunks:
+            if chunks:
+                section.content += b"".join(chunks).decode("utf-8")
+        self._section_chunks = []
+        self._current_chunks = []
+            
         # Validate document structure
         self._validate_document()
     
@@ -264,15 +434,16 @@ class DocumentParser:
         if self.document.sections and self.document.sections[0].subsections:
             found_sections.extend([sub.name for sub in self.document.sections[0].subsections])
             
-        logger.info(f"Found sections: {found_sections}")
+        logger.info("Found sections: %s", found_sections)
+        found_lower = tuple(section.lower() for section in found_sections)
         missing_sections = []
         
-        for expected in self.expected_sections:
-            if not any(expected.lower() in section.lower() for section in found_sections):
+        for expected, expected_lower in zip(self.expected_sections, self._expected_sections_lower):
+            if not any(expected_lower in section for section in found_lower):
                 missing_sections.append(expected)
                 
         if missing_sections:
-            logger.warning(f"Missing expected sections: {', '.join(missing_sections)}")
+            logger.warning("Missing expected sections: %s", ", ".join(missing_sections))
 
 
 def parse_document(filepath: str, title: Optional[str] = None) -> Document:
@@ -291,3 +462,23 @@ def parse_document(filepath: str, title: Optional[str] = None) -> Document:
     """
     parser = DocumentParser()
     return parser.parse_file(filepath, title)
+
+
+def parse_document_from_bytes(data: bytes, source_name: str, title: Optional[str] = None) -> Document:
+    """
+    Parse markdown content held in memory into a structured Document object.
+    
+    Args:
+        data: UTF-8 encoded markdown content
+        source_name: Name of the source (e.g. its file name), used for the
+            default title and in messages
+        title: Optional document title
+        
+    Returns:
+        Document: The structured document object
+        
+    Raises:
+        ParserError: If parsing fails
+    """
+    parser = DocumentParser()
+    return parser.parse_bytes(data, source_name, title)
@@ -1,61 +0,0 @@
-"""
-Amalga Doc Parser - A tool for parsing and managing healthcare platform analysis documents.
-"""
-
-__version__ = "0.1.0"
-
-# Import and expose public modules and functions
-from .parser import parse_document, DocumentParser, ParserError
-from .models import Document, Section, Table, Reference
-
-# Define what's available when using "from amalga_doc_parser import *"
-__all__ = [
-    'parse_document',
-    'DocumentParser',
-    'ParserError',
-    'Document',
-    'Section',
-    'Table',
-    'Reference',
-]
-
-# Import and expose public modules and functions
-from .parser import parse_document, DocumentParser, ParserError
-from .models import Document, Section, Table, Reference
-
-# Define what's available when using "from amalga_doc_parser import *"
-__all__ = [
-    'parse_document',
-    'DocumentParser',
-    'ParserError',
-    'Document',
-    'Section',
-    'Table',
-    'Reference',
-]
-from .parser import parse_document, DocumentParser, ParserError
-from .models import Document, Section, Table, Reference
-
-# Define what's available when using "from amalga_doc_parser import *"
-__all__ = [
-    'parse_document',
-    'DocumentParser',
-    'ParserError',
-    'Document',
-    'Section',
-    'Table',
-    'Reference',
-]
-from .parser import parse_document, DocumentParser, ParserError
-from .models import Document, Section, Table, Reference
-
-# Define what's available when using "from amalga_doc_parser import *"
-__all__ = [
-    'parse_document',
-    'DocumentParser',
-    'ParserError',
-    'Document',
-    'Section',
-    'Table',
-    'Reference',
-]
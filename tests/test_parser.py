@@ -4,55 +4,99 @@ Tests for amalga_doc_parser module.
 This module contains tests for the document parser functionality.
 """
 
+import dataclasses
+import io
 import os
+import threading
 import unittest
+from unittest import mock
 import json
+import tempfile
+from datetime import datetime
 from pathlib import Path
 
-from amalga_doc_parser import parse_document
+from amalga_doc_parser import parse_document, parse_document_from_bytes
 from amalga_doc_parser.models import Document, Section, Table, Reference
-from amalga_doc_parser.parser import DocumentParser, ParserError
+from amalga_doc_parser.parser import ParserError, _iter_lines
+from amalga_doc_parser import parser
+from amalga_doc_parser import models
+
+TEST_DATA_DIR = Path(__file__).parent / "data"
+SAMPLE_FILE = TEST_DATA_DIR / "sample.md"
 
 
 class TestDocumentParser(unittest.TestCase):
     """Test cases for the document parser functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_data_dir = Path(__file__).parent / "data"
-        self.sample_file = self.test_data_dir / "sample.md"
-        self.parser = DocumentParser()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test, parsing the sample once."""
+        # Fail the whole class up front rather than every test separately
+        if not SAMPLE_FILE.is_file():
+            raise FileNotFoundError(f"Sample file not found: {SAMPLE_FILE}")
+        with open(SAMPLE_FILE, "rb", buffering=1 << 16) as f:
+            cls._sample_bytes = f.read()
+        cls.parsed_doc = parse_document_from_bytes(cls._sample_bytes, SAMPLE_FILE.name)
+        cls.sample_json = cls.parsed_doc.to_json()
+        cls.json_data = json.loads(cls.sample_json)
+        
+        # Name-keyed indexes so tests can look up sections and tables directly;
+        # on a repeated name or caption the first one wins, as in a linear scan
+        cls._sections_by_name = {}
+        for section in cls.parsed_doc.sections:
+            cls._sections_by_name.setdefault(section.name, section)
+        cls._tables_by_caption = {}
+        for table in cls.parsed_doc.tables:
+            cls._tables_by_caption.setdefault(table.caption, table)
+        cls._found_sections = {}
+        cls._refs_by_id = cls.parsed_doc.references_by_id()
+        cls._found_tables = {}
+        
+    @classmethod
+    def _find_section(cls, substr):
+        """Return the first top-level section whose name contains substr, or None."""
+        if substr not in cls._found_sections:
+            cls._found_sections[substr] = next(
+                (s for name, s in cls._sections_by_name.items() if substr in name), None)
+        return cls._found_sections[substr]
         
-    def test_file_exists(self):
-        """Test that the sample file exists."""
-        self.assertTrue(os.path.exists(self.sample_file), 
-                       f"Sample file not found: {self.sample_file}")
+    @classmethod
+    def _find_table(cls, substr):
+        """Return the first table whose caption contains substr, or None."""
+        if substr not in cls._found_tables:
+            cls._found_tables[substr] = next(
+                (t for caption, t in cls._tables_by_caption.items() if substr in caption), None)
+        return cls._found_tables[substr]
         
     def test_parse_document(self):
         """Test parsing a complete document."""
-        document = parse_document(str(self.sample_file))
+        document = self.parsed_doc
         
         # Basic document structure checks
         self.assertIsInstance(document, Document)
         self.assertEqual(document.title, "Sample Platform Analysis")  # Based on document's first level-1 header
         
         # Check sections
-        self.assertGreaterEqual(len(document.sections), 4, 
-                               "Document should have at least 4 top-level sections")
+        with self.subTest(check="sections"):
+            self.assertGreaterEqual(len(document.sections), 4, 
+                                   "Document should have at least 4 top-level sections")
         
         # Check section names
-        section_names = [section.name for section in document.sections]
-        self.assertIn("Executive Summary", section_names)
-        self.assertIn("Platform Overview: Origins, Evolution, and Market Context", 
-                     section_names)
+        section_names = {section.name for section in document.sections}
+        for expected in ("Executive Summary",
+                         "Platform Overview: Origins, Evolution, and Market Context"):
+            with self.subTest(check="section_name", name=expected):
+                self.assertIn(expected, section_names)
         
         # Check tables
-        self.assertGreaterEqual(len(document.tables), 1, 
-                               "Document should have at least one table")
+        with self.subTest(check="tables"):
+            self.assertGreaterEqual(len(document.tables), 1, 
+                                   "Document should have at least one table")
         
         # Check references
-        self.assertGreaterEqual(len(document.references), 3, 
-                               "Document should have at least 3 references")
+        with self.subTest(check="references"):
+            self.assertGreaterEqual(len(document.references), 3, 
+                                   "Document should have at least 3 references")
 
     def test_document_serialization(self):
         """Test JSON serialization and deserialization."""
@@ -72,18 +116,12 @@ class TestDocumentParser(unittest.TestCase):
         self.assertEqual(len(loaded_doc.sections), 1)
         self.assertEqual(len(loaded_doc.tables), 1)
         self.assertEqual(len(loaded_doc.references), 1)
+        self.assertEqual(loaded_doc.references_by_id()["1"].text, "Test Reference")
         
     def test_section_hierarchy(self):
         """Test correct parsing of section hierarchy."""
-        document = parse_document(str(self.sample_file))
-        
         # Find Platform Overview section
-        platform_section = None
-        for section in document.sections:
-            if "Platform Overview" in section.name:
-                platform_section = section
-                break
-                
+        platform_section = self._find_section("Platform Overview")
         self.assertIsNotNone(platform_section, 
                             "Platform Overview section should exist")
         
@@ -92,21 +130,14 @@ class TestDocumentParser(unittest.TestCase):
                                "Platform Overview should have at least 2 subsections")
         
         # Check specific subsection
-        subsection_names = [sub.name for sub in platform_section.subsections]
+        subsection_names = {sub.name for sub in platform_section.subsections}
         self.assertIn("From Azyxxi to Microsoft Amalga: The Genesis", 
                      subsection_names)
         
     def test_table_parsing(self):
         """Test table extraction and parsing."""
-        document = parse_document(str(self.sample_file))
-        
         # Find the product family table
-        product_table = None
-        for table in document.tables:
-            if "Product Family" in table.caption:
-                product_table = table
-                break
-                
+        product_table = self._find_table("Product Family")
         self.assertIsNotNone(product_table, 
                             "Product Family table should be extracted")
         
@@ -120,27 +151,85 @@ class TestDocumentParser(unittest.TestCase):
         self.assertIn("Product Name", product_table.headers)
         
         # Check a specific cell value (flattened search)
-        found_uis = False
-        for row in product_table.rows:
-            for cell in row:
-                if "UIS" in cell:
-                    found_uis = True
-                    break
+        found_uis = any("UIS" in cell for row in product_table.rows for cell in row)
         self.assertTrue(found_uis, "Table should contain UIS reference")
         
     def test_reference_extraction(self):
         """Test extraction of numbered references."""
-        document = parse_document(str(self.sample_file))
+        document = self.parsed_doc
         
         # Check we have the expected references
         self.assertGreaterEqual(len(document.references), 3)
         
-        # Build a dict of references by ID for easier checking
-        refs_by_id = {ref.id: ref.text for ref in document.references}
-        
         # Check specific references
-        self.assertIn("1", refs_by_id)
-        self.assertIn("Microsoft", refs_by_id["1"])  # First reference should mention Microsoft
+        self.assertIn("1", self._refs_by_id)
+        self.assertIn("Microsoft", self._refs_by_id["1"].text)  # First reference should mention Microsoft
+        
+    def test_parse_file_matches_bytes(self):
+        """Test that parsing from a path and from bytes give the same document."""
+        from_file = parse_document(str(SAMPLE_FILE))
+        self.assertEqual(from_file.title, self.parsed_doc.title)
+        self.assertEqual(from_file.sections, self.parsed_doc.sections)
+        self.assertEqual(from_file.tables, self.parsed_doc.tables)
+        self.assertEqual(from_file.references, self.parsed_doc.references)
+        
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "named pipes are not supported")
+    def test_parse_pipe(self):
+        """Test parsing from a pipe, whose reported size is 0."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fifo = Path(tmpdir) / "input.md"
+            os.mkfifo(str(fifo))
+            
+            def write():
+                with open(str(fifo), "wb") as f:
+                    f.write(b"# T\n## Sec\nhello\n")
+            
+            writer = threading.Thread(target=write)
+            writer.start()
+            try:
+                document = parse_document(str(fifo))
+            finally:
+                writer.join()
+        
+        self.assertEqual([(s.name, s.content) for s in document.sections],
+                         [("Sec", "hello\n")])
+        
+    def test_trailing_unicode_whitespace_is_stripped(self):
+        """Test that NBSP and other Unicode spaces at line ends are stripped like ASCII ones."""
+        data = ("# Doc\n## Sec\nTable 1: X\n| h | k |\u00a0\n|---|---|\n| 1 | 2 |\u2003\n"
+                "\u00a0\nafter\u2003\n").encode("utf-8")
+        document = parse_document_from_bytes(data, "doc.md")
+        
+        self.assertEqual(len(document.tables), 1)
+        self.assertEqual(document.tables[0].headers, ["h", "k"])
+        self.assertEqual(document.tables[0].rows, [["1", "2"]])
+        self.assertEqual(document.sections[0].content, "Table 1: X\nafter\n")
+        
+    def test_public_patterns_match_text(self):
+        """Test that the module's public patterns still match str lines."""
+        self.assertEqual(parser.SECTION_HEADER_PATTERN.match("## 2.1. Scope").groups(),
+                         ("##", "2.1. ", "Scope"))
+        self.assertTrue(parser.TABLE_ROW_PATTERN.match("| a | b |"))
+        self.assertTrue(parser.TABLE_SEPARATOR_PATTERN.match("|---|:--:|"))
+        self.assertEqual(parser.TABLE_CAPTION_PATTERN.match("Table 1: Products").group(1), "Products")
+        self.assertEqual(parser.REFERENCE_PATTERN.match("[1] Microsoft").groups(), ("1", "Microsoft"))
+        
+    def test_iter_lines_across_chunk_boundaries(self):
+        """Test that chunked line splitting matches splitting the whole input."""
+        samples = [
+            b"# Title\r\nSome text\r\n\r\n| a | b |\r\n",
+            b"old\rmac\rline\rendings\r",
+            b"mixed\n\r\n\rlone\r\rcr\nno trailing newline",
+            b"\r\n\r\n",
+            b"\r",
+            b"",
+        ]
+        for data in samples:
+            expected = data.splitlines(keepends=True)
+            for chunk_size in range(1, len(data) + 2):
+                with self.subTest(data=data, chunk_size=chunk_size):
+                    read = io.BytesIO(data).read
+                    self.assertEqual(list(_iter_lines(read, chunk_size)), expected)
         
     def test_nonexistent_file(self):
         """Test error handling for non-existent files."""
@@ -149,26 +238,18 @@ class TestDocumentParser(unittest.TestCase):
             
     def test_document_to_json(self):
         """Test serialization of document to JSON."""
-        document = parse_document(str(self.sample_file))
-        json_str = document.to_json()
-        
-        # Verify it's valid JSON
-        try:
-            json_data = json.loads(json_str)
-            self.assertIsInstance(json_data, dict)
-            self.assertIn("title", json_data)
-            self.assertIn("sections", json_data)
-            self.assertIn("metadata", json_data)
-        except json.JSONDecodeError:
-            self.fail("Document to_json() did not produce valid JSON")
+        # setUpClass already decoded the JSON, so invalid output fails there
+        self.assertIsInstance(self.json_data, dict)
+        self.assertIn("title", self.json_data)
+        self.assertIn("sections", self.json_data)
+        self.assertIn("metadata", self.json_data)
             
     def test_document_roundtrip(self):
         """Test document serialization and deserialization roundtrip."""
-        original = parse_document(str(self.sample_file))
-        json_str = original.to_json()
+        original = self.parsed_doc
         
         # Deserialize back to document
-        roundtrip = Document.from_json(json_str)
+        roundtrip = Document.from_json(self.sample_json)
         
         # Check key properties match
         self.assertEqual(original.title, roundtrip.title)
@@ -176,6 +257,166 @@ class TestDocumentParser(unittest.TestCase):
         self.assertEqual(len(original.tables), len(roundtrip.tables))
         self.assertEqual(len(original.references), len(roundtrip.references))
 
+    @unittest.skipUnless(models.ijson, "ijson is not installed")
+    def test_streaming_load_matches_in_memory_load(self):
+        """Test that large files load or fail the same whether or not they are streamed."""
+        def load(path):
+            try:
+                return Document.load_from_file(str(path)).to_dict()
+            except Exception as e:
+                return type(e), str(e)
+        
+        padding = json.dumps("x" * models.STREAMING_THRESHOLD)
+        section = '{"name": "%s", "content": "", "level": 1}'
+        cases = {
+            "sections_object": '{"title": "T", "sections": {"a": 1}}',
+            "empty_sections_object": '{"title": "T", "sections": {}}',
+            "null_tables": '{"title": "T", "metadata": {"tables": null}}',
+            "list_metadata": '{"title": "T", "metadata": [1, 2]}',
+            "duplicate_sections": '{"title": "T", "sections": [%s], "sections": [%s]}' % (
+                section % "First", section % "Second"),
+            "duplicate_references": '{"title": "T", "metadata": {"references": [{"id": "1", "text": "a"}], '
+                                    '"references": [{"id": "2", "text": "b"}]}}',
+            "duplicate_metadata": '{"title": "T", "metadata": {"a": 1}, "metadata": {"b": 2}}',
+            "missing_title": '{"sections": ["not a section"]}',
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, body in cases.items():
+                path = Path(tmpdir) / f"{name}.json"
+                # Pad past the streaming threshold with a key the loaders ignore
+                path.write_text('{"padding": %s, %s' % (padding, body[1:]), encoding="utf-8")
+                with self.subTest(case=name):
+                    with mock.patch.object(models, "ijson", None):
+                        expected = load(path)
+                    self.assertEqual(load(path), expected)
+        
+    def test_references_by_id_follows_list_changes(self):
+        """Test that references_by_id reflects the current references list."""
+        doc = Document(title="Refs")
+        doc.add_reference(Reference(id="1", text="First"))
+        self.assertEqual(list(doc.references_by_id()), ["1"])
+        
+        doc.references = [Reference(id="2", text="Second")]
+        self.assertEqual(list(doc.references_by_id()), ["2"])
+        
+        doc.references[0] = Reference(id="3", text="Third")
+        self.assertEqual(list(doc.references_by_id()), ["3"])
+        
+        doc.references.append(Reference(id="3", text="Later"))
+        self.assertEqual(doc.references_by_id()["3"].text, "Later")
+
+    def test_non_finite_metadata_matches_stdlib(self):
+        """Test that NaN and Infinity serialize and load the same with or without orjson."""
+        doc = Document(title="Floats", metadata={"created_at": "2024-01-01T00:00:00",
+                                                 "score": float("nan"), "bounds": [float("-inf"), 1.5]})
+        with mock.patch.object(models, "orjson", None):
+            expected = doc.to_json()
+        self.assertIn("NaN", expected)
+        self.assertEqual(doc.to_json(), expected)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "document.json"
+            doc.save_to_file(str(path))
+            self.assertEqual(path.read_text(encoding="utf-8"), expected)
+            loaded = Document.load_from_file(str(path))
+        self.assertEqual(loaded.metadata["bounds"], [float("-inf"), 1.5])
+        
+    def test_from_json_same_with_and_without_msgspec(self):
+        """Test that from_json accepts and rejects the same input whether or not msgspec is installed."""
+        def load(json_str):
+            try:
+                return Document.from_json(json_str).to_dict()
+            except Exception as e:
+                return type(e), str(e)
+        
+        section = {"name": "S", "raw_name": "1. S", "content": "text", "level": 1}
+        cases = {
+            "sample": self.sample_json,
+            "missing_content": {"title": "T", "sections": [{"name": "S", "level": 1}]},
+            "missing_level": {"title": "T", "sections": [{"name": "S", "content": ""}]},
+            "nested_missing_content": {"title": "T", "sections": [
+                {**section, "subsections": [{"name": "Sub", "level": 2}]}]},
+            "missing_raw_name": {"title": "T", "sections": [{"name": "S", "content": "", "level": 1}]},
+            "private_field": {"title": "T", "sections": [{**section, "_content_buf": ["eA=="]}]},
+            "missing_title": {"sections": [section]},
+        }
+        for name, case in cases.items():
+            json_str = case if isinstance(case, str) else json.dumps(case)
+            with self.subTest(case=name):
+                with mock.patch.object(models, "msgspec", None):
+                    expected = load(json_str)
+                self.assertEqual(load(json_str), expected)
+        
+    def test_to_json_matches_stdlib(self):
+        """Test that to_json output and errors do not depend on whether orjson is installed."""
+        def dump(doc, **kwargs):
+            try:
+                return doc.to_json(**kwargs)
+            except Exception as e:
+                return type(e)
+        
+        metadata = {"created_at": "2024-01-01T00:00:00", "count": 3, "ratio": 1e16,
+                    "tags": ("a", "b"), "nested": {"flag": True, "none": None}}
+        docs = {
+            "plain": Document(title="Plain", metadata=dict(metadata)),
+            "datetime": Document(title="Dates", metadata={**metadata, "at": datetime(2024, 1, 1)}),
+            "non_str_keys": Document(title="Keys", metadata={**metadata, "by_id": {1: "a"}}),
+        }
+        for name, doc in docs.items():
+            for indent in (2, None, 4):
+                with self.subTest(doc=name, indent=indent):
+                    with mock.patch.object(models, "orjson", None):
+                        expected = dump(doc, indent=indent)
+                    self.assertEqual(dump(doc, indent=indent), expected)
+        
+        # Non-ASCII text may be escaped differently but must decode the same
+        doc = Document(title="Café", metadata={"created_at": "2024-01-01T00:00:00"})
+        with mock.patch.object(models, "orjson", None):
+            expected = json.loads(doc.to_json())
+        self.assertEqual(json.loads(doc.to_json()), expected)
+        
+    def test_parsed_sections_carry_no_parser_state(self):
+        """Test that parsed sections hold exactly the model's serialized fields."""
+        section = self._find_section("Platform Overview")
+        self.assertEqual(dataclasses.asdict(section), section.to_dict())
+        
+    def test_loaded_document_keeps_metadata(self):
+        """Test that deserializing does not stamp a new creation time."""
+        stored = Document.from_dict({"title": "Stored", "metadata": {"created_at": "2024-01-01T00:00:00"}})
+        self.assertEqual(stored.metadata["created_at"], "2024-01-01T00:00:00")
+        
+        legacy = Document.from_dict({"title": "Legacy", "metadata": {}})
+        self.assertNotIn("created_at", legacy.metadata)
+        
+        self.assertIn("created_at", Document(title="New").metadata)
+
+    @unittest.skipUnless(models.ijson, "ijson is not installed")
+    def test_streaming_load_matches_full_load(self):
+        """Test that the streaming JSON loader rebuilds the same document."""
+        # Work on a copy so the shared parsed document stays untouched
+        original = Document.from_json(self.sample_json)
+        original.metadata["source"] = {"pages": [1, 2]}
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "document.json"
+            original.save_to_file(str(path))
+            with open(path, "rb") as f:
+                streamed = Document._from_json_stream(f)
+        
+        self.assertEqual(original.to_dict(), streamed.to_dict())
+        
+    @unittest.skipUnless(models.ijson, "ijson is not installed")
+    def test_large_file_with_non_finite_metadata_loads(self):
+        """Test that files over the streaming threshold holding NaN still load."""
+        doc = Document(title="Large", metadata={"score": float("nan"),
+                                                "padding": "x" * models.STREAMING_THRESHOLD})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "document.json"
+            doc.save_to_file(str(path))
+            loaded = Document.load_from_file(str(path))
+        self.assertNotEqual(loaded.metadata["score"], loaded.metadata["score"])
+        self.assertEqual(loaded.metadata["padding"], doc.metadata["padding"])
+
 
 if __name__ == '__main__':
     unittest.main()